@@ -12,15 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import inspect
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from datasets import ClassLabel, Dataset, Sequence
 from typing_extensions import Literal
 
 from ..module import EvaluationModule
 from ..utils.file_utils import add_end_docstrings, add_start_docstrings
 from .base import EVALUATOR_COMPUTE_RETURN_DOCSTRING, EVALUTOR_COMPUTE_START_DOCSTRING, Evaluator
-from .utils import DatasetColumn
 
 
 TASK_DOCUMENTATION = r"""
@@ -98,39 +101,44 @@ class TokenClassificationEvaluator(Evaluator):
     def __init__(self, task="token-classification", default_metric_name=None):
         super().__init__(task, default_metric_name=default_metric_name)
 
-    def predictions_processor(self, predictions: List[List[Dict]], words: List[List[str]], join_by: str):
+    def predictions_processor(
+        self, predictions: List[List[Dict]], words: Union[List[List[str]], pa.ChunkedArray], join_by: str
+    ):
         """
         Transform the pipeline predictions into a list of predicted labels of the same length as the true labels.
 
         Args:
             predictions (`List[List[Dict]]`):
                 List of pipeline predictions, where each token has been labeled.
-            words (`List[List[str]]`):
-                Original input data to the pipeline, used to build predicted labels of the same length.
+            words (`List[List[str]]` or `pyarrow.ChunkedArray`):
+                Original input data to the pipeline, used to build predicted labels of the same length. Passing the
+                Arrow list column of the dataset avoids converting it to Python lists.
             join_by (`str`):
                 String to use to join two words. In English, it will typically be " ".
 
         Returns:
             `dict`: a dictionary holding the predictions
         """
+        # get the indexes of the start character of each word, for all the rows at once
+        word_starts, word_row_offsets = self._words_starts(words, join_by)
+
+        word_starts, word_row_offsets = word_starts.tolist(), word_row_offsets.tolist()
         preds = []
 
         # iterate over the data rows
         for i, prediction in enumerate(predictions):
             pred_processed = []
-
-            # get a list of tuples giving the indexes of the start and end character of each word
-            words_offsets = self.words_to_offsets(words[i], join_by)
+            num_tokens = len(prediction)
 
             token_index = 0
-            for word_offset in words_offsets:
+            for word_start in word_starts[word_row_offsets[i] : word_row_offsets[i + 1]]:
                 # for each word, we may keep only the predicted label for the first token, discard the others
-                while prediction[token_index]["start"] < word_offset[0]:
+                while token_index < num_tokens and prediction[token_index]["start"] < word_start:
                     token_index += 1
 
-                if prediction[token_index]["start"] > word_offset[0]:  # bad indexing
+                if token_index == num_tokens or prediction[token_index]["start"] > word_start:  # bad indexing
                     pred_processed.append("O")
-                elif prediction[token_index]["start"] == word_offset[0]:
+                else:
                     pred_processed.append(prediction[token_index]["entity"])
 
             preds.append(pred_processed)
@@ -160,7 +168,38 @@ class TokenClassificationEvaluator(Evaluator):
 
         return offsets
 
-    def prepare_data(self, data: Union[str, Dataset], input_column: str, label_column: str, join_by: str):
+    @staticmethod
+    def _words_starts(
+        words: Union[List[List[str]], pa.Array, pa.ChunkedArray], join_by: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the start index of each word of every row at once, from the offsets of the Arrow list of words.
+        Returns the flat start indexes of all the words, and the offsets of the words of each row.
+        """
+        if not isinstance(words, (pa.Array, pa.ChunkedArray)):
+            words = pa.array(words, type=pa.list_(pa.string()))
+        if isinstance(words, pa.ChunkedArray):
+            words = words.combine_chunks()
+
+        row_offsets = words.offsets.to_numpy()
+        row_offsets = row_offsets - row_offsets[0]
+        lengths = pc.utf8_length(pc.list_flatten(words)).to_numpy().astype(np.int64)
+
+        # offsets over the whole column, reset at the first word of each row
+        strides = lengths + len(join_by)
+        cumulated = np.concatenate(([0], np.cumsum(strides)))
+        starts = cumulated[:-1] - np.repeat(cumulated[row_offsets[:-1]], np.diff(row_offsets))
+
+        return starts, row_offsets
+
+    def prepare_data(
+        self,
+        data: Union[str, Dataset],
+        input_column: str,
+        label_column: str,
+        join_by: str,
+        is_split_into_words: bool = False,
+    ):
         super().prepare_data(data, input_column, label_column)
 
         if not isinstance(data.features[input_column], Sequence) or not isinstance(
@@ -175,8 +214,10 @@ class TokenClassificationEvaluator(Evaluator):
         labels_are_int = isinstance(data.features[label_column].feature, ClassLabel)
         if labels_are_int:
             label_list = data.features[label_column].feature.names  # list of string labels
-            id_to_label = {i: label for i, label in enumerate(label_list)}
-            references = [[id_to_label[label_id] for label_id in label_ids] for label_ids in data[label_column]]
+            # gather the string labels over the flat buffer of label ids, and rebuild the lists with the same offsets
+            label_ids = data.with_format("arrow")[label_column].combine_chunks()
+            labels = pc.take(pa.array(label_list), label_ids.values)
+            references = pa.ListArray.from_arrays(label_ids.offsets, labels).to_pylist()
         elif data.features[label_column].feature.dtype.startswith("int"):
             raise NotImplementedError(
                 "References provided as integers, but the reference column is not a Sequence of ClassLabels."
@@ -187,8 +228,15 @@ class TokenClassificationEvaluator(Evaluator):
             references = data[label_column]
 
         metric_inputs = {"references": references}
-        data = data.map(lambda x: {input_column: join_by.join(x[input_column])})
-        pipeline_inputs = DatasetColumn(data, input_column)
+
+        words = data.with_format("arrow")[input_column]
+        if is_split_into_words:
+            # the pipeline tokenizes the words itself, there is no need to join them
+            return metric_inputs, words.to_pylist()
+
+        # join the words in Arrow directly, without going through a `map` writing a new cache file, and convert the
+        # column to Python in one go rather than row by row through the dataset formatting
+        pipeline_inputs = pc.binary_join(words, join_by).to_pylist()
 
         return metric_inputs, pipeline_inputs
 
@@ -201,16 +249,41 @@ class TokenClassificationEvaluator(Evaluator):
     ):
         pipe = super().prepare_pipeline(model_or_pipeline, tokenizer, feature_extractor, device)
 
-        # check the pipeline outputs start characters in its predictions
-        dummy_output = pipe(["2003 New York Gregory"], **self.PIPELINE_KWARGS)
-        if dummy_output[0][0]["start"] is None:
-            raise ValueError(
-                "TokenClassificationEvaluator supports only pipelines giving 'start' index as a pipeline output (got None). "
-                "Transformers pipelines with a slow tokenizer will raise this error."
-            )
+        # check the pipeline outputs start characters in its predictions. With a transformers tokenizer, they are
+        # given only by fast tokenizers, so we can tell without running the model on a dummy input
+        tokenizer = getattr(pipe, "tokenizer", None)
+        if hasattr(tokenizer, "is_fast"):
+            if not tokenizer.is_fast:
+                raise ValueError(
+                    "TokenClassificationEvaluator supports only pipelines giving 'start' index as a pipeline output, "
+                    "which requires a fast tokenizer (got a slow tokenizer)."
+                )
+        else:
+            dummy_output = pipe(["2003 New York Gregory"], **self.PIPELINE_KWARGS)
+            if dummy_output[0][0]["start"] is None:
+                raise ValueError(
+                    "TokenClassificationEvaluator supports only pipelines giving 'start' index as a pipeline output (got None). "
+                    "Transformers pipelines with a slow tokenizer will raise this error."
+                )
 
         return pipe
 
+    @staticmethod
+    def _supports_split_words(pipe) -> bool:
+        """
+        Check whether the pipeline accepts inputs already split into words, which requires a fast tokenizer. Byte-level
+        BPE tokenizers (e.g. RoBERTa, GPT-2) additionally need to be instantiated with `add_prefix_space=True`.
+        """
+        tokenizer = getattr(pipe, "tokenizer", None)
+        sanitize_parameters = getattr(pipe, "_sanitize_parameters", None)
+        if not getattr(tokenizer, "is_fast", False) or sanitize_parameters is None:
+            return False
+        if not getattr(tokenizer, "add_prefix_space", True):
+            return False
+
+        parameters = inspect.signature(sanitize_parameters).parameters
+        return "is_split_into_words" in parameters and "delimiter" in parameters
+
     @add_start_docstrings(EVALUTOR_COMPUTE_START_DOCSTRING)
     @add_end_docstrings(EVALUATOR_COMPUTE_RETURN_DOCSTRING, TASK_DOCUMENTATION)
     def compute(
@@ -231,6 +304,8 @@ class TokenClassificationEvaluator(Evaluator):
         input_column: str = "tokens",
         label_column: str = "ner_tags",
         join_by: Optional[str] = " ",
+        is_split_into_words: bool = False,
+        batch_size: Optional[int] = None,
     ) -> Tuple[Dict[str, float], Any]:
         """
         input_column (`str`, defaults to `"tokens"`):
@@ -240,6 +315,12 @@ class TokenClassificationEvaluator(Evaluator):
         join_by (`str`, *optional*, defaults to `" "`):
             This evaluator supports dataset whose input column is a list of words. This parameter specifies how to join
             words to generate a string input. This is especially useful for languages that do not separate words by a space.
+        is_split_into_words (`bool`, defaults to `False`):
+            Whether to feed the lists of words to the pipeline directly, instead of the words joined by `join_by`. This
+            avoids building the joined strings, but requires a pipeline supporting `is_split_into_words` with a fast
+            tokenizer. Since each word is then tokenized on its own, the predictions may differ from the joined inputs.
+        batch_size (`int`, *optional*, defaults to `None`):
+            Batch size forwarded to the pipeline call. If `None`, the pipeline uses its own default.
         """
         result = {}
 
@@ -248,14 +329,27 @@ class TokenClassificationEvaluator(Evaluator):
         # Prepare inputs
         data = self.load_data(data=data, subset=subset, split=split)
         metric_inputs, pipe_inputs = self.prepare_data(
-            data=data, input_column=input_column, label_column=label_column, join_by=join_by
+            data=data,
+            input_column=input_column,
+            label_column=label_column,
+            join_by=join_by,
+            is_split_into_words=is_split_into_words,
         )
         pipe = self.prepare_pipeline(model_or_pipeline=model_or_pipeline, tokenizer=tokenizer, device=device)
+        if is_split_into_words and not self._supports_split_words(pipe):
+            raise ValueError(
+                "`is_split_into_words=True` requires a pipeline accepting `is_split_into_words` and `delimiter`, with a "
+                "fast tokenizer. Byte-level BPE tokenizers must also be instantiated with `add_prefix_space=True`."
+            )
         metric = self.prepare_metric(metric)
 
         # Compute predictions
-        predictions, perf_results = self.call_pipeline(pipe, pipe_inputs)
-        predictions = self.predictions_processor(predictions, data[input_column], join_by)
+        words = data.with_format("arrow")[input_column]
+        pipe_kwargs = {"is_split_into_words": True, "delimiter": join_by} if is_split_into_words else {}
+        if batch_size is not None:
+            pipe_kwargs["batch_size"] = batch_size
+        predictions, perf_results = self.call_pipeline(pipe, pipe_inputs, **pipe_kwargs)
+        predictions = self.predictions_processor(predictions, words, join_by)
         metric_inputs.update(predictions)
 
         # Compute metrics from references and predictions
@@ -15,6 +15,7 @@
 # Lint as: python3
 
 from time import sleep
+from types import SimpleNamespace
 from unittest import TestCase, mock
 
 import numpy as np
@@ -122,6 +123,33 @@ class DummyTokenClassificationPipeline:
         return [result]
 
 
+class DummySplitWordsTokenClassificationPipeline(DummyTokenClassificationPipeline):
+    def __init__(self):
+        super().__init__()
+        self.tokenizer = SimpleNamespace(is_fast=True)
+        self.inputs = None
+        self.delimiter = None
+
+    def _sanitize_parameters(self, is_split_into_words=False, delimiter=None, **kwargs):
+        pass
+
+    def __call__(self, inputs, is_split_into_words=False, delimiter=None, **kwargs):
+        if is_split_into_words:
+            self.inputs = [list(words) for words in inputs]
+            self.delimiter = delimiter
+        return super().__call__(inputs, **kwargs)
+
+
+class DummyKwargsTokenClassificationPipeline(DummyTokenClassificationPipeline):
+    def __init__(self):
+        super().__init__()
+        self.kwargs = None
+
+    def __call__(self, inputs, **kwargs):
+        self.kwargs = kwargs
+        return super().__call__(inputs, **kwargs)
+
+
 class DummyAutomaticSpeechRecognitionPipeline:
     def __init__(self) -> None:
         self.task = "automatic-speech-recognition"
@@ -733,6 +761,78 @@ class TestTokenClassificationEvaluator(TestCase):
         )
         self.assertEqual(results["overall_accuracy"], 1.0)
 
+    def test_split_words_pipe(self):
+        # the words are joined unless requested otherwise
+        pipe = DummySplitWordsTokenClassificationPipeline()
+        results = self.evaluator.compute(
+            model_or_pipeline=pipe,
+            data=self.data,
+            metric="seqeval",
+        )
+        self.assertEqual(results["overall_accuracy"], 1.0)
+        self.assertIsNone(pipe.inputs)
+
+        results = self.evaluator.compute(
+            model_or_pipeline=pipe,
+            data=self.data,
+            metric="seqeval",
+            is_split_into_words=True,
+        )
+        self.assertEqual(results["overall_accuracy"], 1.0)
+        self.assertListEqual(pipe.inputs, self.data["tokens"])
+        self.assertEqual(pipe.delimiter, " ")
+
+        # the delimiter used by the pipeline must be `join_by`, which the word offsets are computed with
+        self.evaluator.compute(
+            model_or_pipeline=pipe,
+            data=self.data,
+            metric="seqeval",
+            is_split_into_words=True,
+            join_by="",
+        )
+        self.assertEqual(pipe.delimiter, "")
+
+        # byte-level BPE tokenizers only accept words with `add_prefix_space=True`
+        pipe.tokenizer.add_prefix_space = False
+        with self.assertRaises(ValueError):
+            self.evaluator.compute(
+                model_or_pipeline=pipe,
+                data=self.data,
+                metric="seqeval",
+                is_split_into_words=True,
+            )
+
+    def test_slow_tokenizer_pipe(self):
+        pipe = DummyTokenClassificationPipeline()
+        with mock.patch.object(
+            DummyTokenClassificationPipeline,
+            "__call__",
+            autospec=True,
+            side_effect=DummyTokenClassificationPipeline.__call__,
+        ) as pipe_call:
+            # without a tokenizer to inspect, the pipeline is run on a dummy input
+            self.evaluator.prepare_pipeline(model_or_pipeline=pipe)
+            self.assertEqual(pipe_call.call_count, 1)
+
+            # otherwise the tokenizer tells whether start offsets are given, without running the pipeline
+            pipe_call.reset_mock()
+            pipe.tokenizer = SimpleNamespace(is_fast=True)
+            self.assertIs(self.evaluator.prepare_pipeline(model_or_pipeline=pipe), pipe)
+            self.assertEqual(pipe_call.call_count, 0)
+
+            pipe.tokenizer.is_fast = False
+            with self.assertRaises(ValueError):
+                self.evaluator.prepare_pipeline(model_or_pipeline=pipe)
+            self.assertEqual(pipe_call.call_count, 0)
+
+    def test_batch_size(self):
+        pipe = DummyKwargsTokenClassificationPipeline()
+        self.evaluator.compute(model_or_pipeline=pipe, data=self.data, metric="seqeval")
+        self.assertNotIn("batch_size", pipe.kwargs)
+
+        self.evaluator.compute(model_or_pipeline=pipe, data=self.data, metric="seqeval", batch_size=8)
+        self.assertEqual(pipe.kwargs["batch_size"], 8)
+
     @slow
     def test_default_pipe_init(self):
         results = self.evaluator.compute(
@@ -780,6 +880,36 @@ class TestTokenClassificationEvaluator(TestCase):
         # Test that the data point returned is correct; this maps to the first example in the dataset
         self.assertEqual(data[0]["id"], "0")
 
+    def test_prepare_data(self):
+        data = Dataset.from_dict(
+            {
+                "tokens": [["New", "York"], ["a", "nice", "City", "."]],
+                "ner_tags": [[1, 2], [0, 0, 1, 0]],
+            },
+            features=self.data.features,
+        )
+        # the indices mapping of the selection should be taken into account
+        data = data.select([1, 0])
+
+        metric_inputs, pipeline_inputs = self.evaluator.prepare_data(
+            data=data,
+            input_column="tokens",
+            label_column="ner_tags",
+            join_by=" ",
+        )
+
+        self.assertListEqual(list(pipeline_inputs), ["a nice City .", "New York"])
+        self.assertListEqual(metric_inputs["references"], [["O", "O", "B-LOC", "O"], ["B-LOC", "I-LOC"]])
+
+        _, pipeline_inputs = self.evaluator.prepare_data(
+            data=data,
+            input_column="tokens",
+            label_column="ner_tags",
+            join_by=" ",
+            is_split_into_words=True,
+        )
+        self.assertListEqual(pipeline_inputs, [["a", "nice", "City", "."], ["New", "York"]])
+
     def test_wrong_task(self):
         self.assertRaises(KeyError, evaluator, "bad_task")
 
@@ -861,6 +991,32 @@ class TestTokenClassificationEvaluator(TestCase):
         predictions = task_evaluator.predictions_processor(predictions, words, join_by)
         self.assertListEqual(predictions["predictions"][0], ["B-LOC", "O", "O", "O", "B-LOC", "O"])
 
+        # words after the last predicted token
+        predictions = [
+            [
+                {"start": 0, "entity": "B-LOC"},
+                {"start": 4, "entity": "I-LOC"},
+                {"start": 9, "entity": "O"},
+            ]
+        ]
+        predictions = task_evaluator.predictions_processor(predictions, words, join_by)
+        self.assertListEqual(predictions["predictions"][0], ["B-LOC", "I-LOC", "O", "O", "O", "O"])
+
+        # several rows, a word must not be matched with the tokens of the next row
+        words = [["New", "York"], ["a", "City"], ["."]]
+        predictions = [
+            [{"start": 0, "entity": "B-LOC"}],
+            [{"start": 0, "entity": "O"}, {"start": 2, "entity": "B-LOC"}],
+            [{"start": 0, "entity": "O"}],
+        ]
+        predictions = task_evaluator.predictions_processor(predictions, words, join_by)
+        self.assertListEqual(predictions["predictions"], [["B-LOC", "O"], ["O", "B-LOC"], ["O"]])
+
+        # entities which are not strings are passed through
+        predictions = [[{"start": 0, "entity": 1}, {"start": 3, "entity": None}]]
+        predictions = task_evaluator.predictions_processor(predictions, [["ab", "cd", "e"]], join_by)
+        self.assertListEqual(predictions["predictions"], [[1, None, "O"]])
+
 
 class TestTextGenerationEvaluator(TestCase):
     def setUp(self):